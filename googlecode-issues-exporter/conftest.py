@@ -0,0 +1,106 @@
+# Copyright 2015 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared pytest fixtures for the issue exporter tests.
+
+The pytest-style tests have no __main__ entry point; run them with pytest.
+When iterating on a single file, skipping the cache plugin trims startup:
+
+  pytest -q -p no:cacheprovider github_issue_converter_test.py
+
+The tests are independent of one another and can be run in parallel with
+pytest-xdist:
+
+  pytest -n auto
+
+Session-scoped fixtures are created once per xdist worker process, so each
+worker has its own fake GitHub service and Init'd exporter.
+"""
+
+# pylint: disable=missing-docstring,protected-access,redefined-outer-name
+
+import copy
+
+import pytest
+
+import github_services
+import issues
+
+from issues_test import DEFAULT_USERNAME
+from issues_test import NO_ISSUE_DATA
+from issues_test import USER_MAP
+from issues_test import REPO
+
+
+# The GitHub username.
+GITHUB_USERNAME = DEFAULT_USERNAME
+# The GitHub repo name.
+GITHUB_REPO = REPO
+# The GitHub oauth token.
+GITHUB_TOKEN = "oauth_token"
+
+# Never try to collect compiled leftovers.
+collect_ignore_glob = ["**/*.pyc"]
+
+
+@pytest.fixture(scope="session")
+def _base_github_service():
+  return github_services.FakeGitHubService(GITHUB_USERNAME, GITHUB_REPO,
+                                           GITHUB_TOKEN)
+
+
+@pytest.fixture
+def github_service(_base_github_service):
+  # The services and the exporter below all share this single fake, so drop
+  # any responses a previous test left unconsumed.
+  _base_github_service.Reset()
+  return _base_github_service
+
+
+@pytest.fixture(scope="session")
+def github_user_service(_base_github_service):
+  return github_services.UserService(_base_github_service)
+
+
+@pytest.fixture(scope="session")
+def github_issue_service(_base_github_service):
+  return github_services.IssueService(_base_github_service, comment_delay=0)
+
+
+@pytest.fixture(scope="session")
+def _base_exporter(_base_github_service, github_issue_service,
+                   github_user_service):
+  _base_github_service.Reset()
+  exporter = issues.IssueExporter(
+      github_issue_service, github_user_service,
+      NO_ISSUE_DATA, GITHUB_REPO, USER_MAP)
+  exporter.Init()
+  return exporter
+
+
+@pytest.fixture
+def issue_exporter(_base_exporter, github_service):
+  # Init() is only run once per session; hand each test a shallow copy with
+  # the mutable state it may touch reset to what Init() leaves behind.
+  exporter = copy.copy(_base_exporter)
+  exporter._issue_json_data = NO_ISSUE_DATA
+  exporter._issue_index = {}
+  exporter._id_mapping = {}
+  exporter._prefix = ""
+  exporter._issue_total = 0
+  exporter._issue_number = 0
+  exporter._comment_number = 0
+  exporter._comment_total = 0
+  exporter._skipped_issues = 0
+  return exporter
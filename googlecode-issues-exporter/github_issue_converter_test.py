@@ -14,251 +14,169 @@
 
 """Tests for the GitHub Services."""
 
-# pylint: disable=missing-docstring,protected-access
+# pylint: disable=missing-docstring,protected-access,redefined-outer-name
 
-import unittest
+import pytest
 
-import github_services
 import issues
 
-from issues_test import DEFAULT_USERNAME
 from issues_test import SINGLE_ISSUE
 from issues_test import COMMENT_ONE
 from issues_test import COMMENT_TWO
 from issues_test import COMMENT_THREE
 from issues_test import COMMENTS_DATA
-from issues_test import NO_ISSUE_DATA
-from issues_test import USER_MAP
-from issues_test import REPO
-
-
-# The GitHub username.
-GITHUB_USERNAME = DEFAULT_USERNAME
-# The GitHub repo name.
-GITHUB_REPO = REPO
-# The GitHub oauth token.
-GITHUB_TOKEN = "oauth_token"
-# The URL used for calls to GitHub.
-GITHUB_API_URL = "https://api.github.com"
-
-
-class TestIssueExporter(unittest.TestCase):
-  """Tests for the IssueService."""
-
-  def setUp(self):
-    self.github_service = github_services.FakeGitHubService(GITHUB_USERNAME,
-                                                            GITHUB_REPO,
-                                                            GITHUB_TOKEN)
-    self.github_user_service = github_services.UserService(
-        self.github_service)
-    self.github_issue_service = github_services.IssueService(
-        self.github_service, comment_delay=0)
-    self.issue_exporter = issues.IssueExporter(
-        self.github_issue_service, self.github_user_service,
-        NO_ISSUE_DATA, GITHUB_REPO, USER_MAP)
-    self.issue_exporter.Init()
-
-    self.TEST_ISSUE_DATA = [
-        {
-            "id": "1",
-            "number": "1",
-            "title": "Title1",
-            "state": "open",
-            "comments": {
-                "items": [COMMENT_ONE, COMMENT_TWO, COMMENT_THREE],
-            },
-            "labels": ["Type-Issue", "Priority-High"],
-            "owner": {"kind": "projecthosting#issuePerson",
-                      "name": "User1"
-                     },
-        },
-        {
-            "id": "2",
-            "number": "2",
-            "title": "Title2",
-            "state": "closed",
-            "owner": {"kind": "projecthosting#issuePerson",
-                      "name": "User2"
-                     },
-            "labels": [],
-            "comments": {
-                "items": [COMMENT_ONE],
-            },
-        },
-        {
-            "id": "3",
-            "number": "3",
-            "title": "Title3",
-            "state": "closed",
-            "comments": {
-                "items": [COMMENT_ONE, COMMENT_TWO],
-            },
-            "labels": ["Type-Defect"],
-            "owner": {"kind": "projecthosting#issuePerson",
-                      "name": "User3"
-                     }
-        }]
-
-
-  def testGetAllPreviousIssues(self):
-    open_issues_response = [{"number": 9, "title": "Title2", "comments": 2}]
-    closed_issues_response = [{"number": 10, "title": "Title1", "comments": 1}]
-
-    self.issue_exporter._issue_json_data = self.TEST_ISSUE_DATA
-    self.github_service.AddResponse(content=open_issues_response)
-    self.github_service.AddResponse(content=closed_issues_response)
-    self.issue_exporter.Init()
-
-    index = self.issue_exporter._issue_index
-    self.assertEqual(3, len(index))
-
-    self.assertEqual(1, len(index["Title1"]))
-    self.assertTrue(index["Title1"][0]["exported"])
-    self.assertEqual('1', index["Title1"][0]["googlecode_id"])
-    self.assertEqual(10, index["Title1"][0]["exported_id"])
-    self.assertEqual(1, index["Title1"][0]["comment_count"])
-
-    self.assertEqual(1, len(index["Title2"]))
-    self.assertTrue(index["Title2"][0]["exported"])
-    self.assertEqual('2', index["Title2"][0]["googlecode_id"])
-    self.assertEqual(9, index["Title2"][0]["exported_id"])
-    self.assertEqual(2, index["Title2"][0]["comment_count"])
-
-    self.assertEqual(1, len(index["Title3"]))
-    self.assertFalse(index["Title3"][0]["exported"])
-
-  def testCreateIssue(self):
-    self.github_service.AddResponse(content={"number": 1234})
-    issue_number = self.issue_exporter._CreateIssue(SINGLE_ISSUE)
-    self.assertEqual(1234, issue_number)
-
-  def testCreateIssueFailedOpenRequest(self):
-    self.github_service.AddFailureResponse()
-    with self.assertRaises(issues.ServiceError):
-      self.issue_exporter._CreateIssue(SINGLE_ISSUE)
-
-  def testCreateIssueFailedCloseRequest(self):
-    content = {"number": 1234}
-    self.github_service.AddResponse(content=content)
-    self.github_service.AddFailureResponse()
-    issue_number = self.issue_exporter._CreateIssue(SINGLE_ISSUE)
-    self.assertEqual(1234, issue_number)
-
-  def testCreateComments(self):
-    self.assertEqual(0, self.issue_exporter._comment_number)
-    self.issue_exporter._CreateComments(COMMENTS_DATA, 1234, SINGLE_ISSUE)
-    self.assertEqual(4, self.issue_exporter._comment_number)
-
-  def testCreateCommentsFailure(self):
-    self.github_service.AddFailureResponse()
-    self.assertEqual(0, self.issue_exporter._comment_number)
-    with self.assertRaises(issues.ServiceError):
-      self.issue_exporter._CreateComments(COMMENTS_DATA, 1234, SINGLE_ISSUE)
-
-  def testStart(self):
-    self.issue_exporter._issue_json_data = self.TEST_ISSUE_DATA
-    self.issue_exporter.Init()
-
-    # Note: Some responses are from CreateIssues, others are from CreateComment.
-    self.github_service.AddResponse(content={"number": 1})
-    self.github_service.AddResponse(content={"number": 10})
-    self.github_service.AddResponse(content={"number": 11})
-    self.github_service.AddResponse(content={"number": 2})
-    self.github_service.AddResponse(content={"number": 20})
-    self.github_service.AddResponse(content={"number": 3})
-    self.github_service.AddResponse(content={"number": 30})
-    self.issue_exporter.Start()
-
-    self.assertEqual(3, self.issue_exporter._issue_total)
-    self.assertEqual(3, self.issue_exporter._issue_number)
-    # Comment counts are per issue and should match the numbers from the last
-    # issue created, minus one for the first comment, which is really
-    # the issue description.
-    self.assertEqual(1, self.issue_exporter._comment_number)
-    self.assertEqual(1, self.issue_exporter._comment_total)
-
-  def testStart_SkipDeletedComments(self):
-    comment = {
-        "content": "one",
-        "id": 1,
-        "published": "last year",
-        "author": {"name": "user@email.com"},
-        "updates": {
-            "labels": ["added-label", "-removed-label"],
-            },
-        }
-
-    self.issue_exporter._issue_json_data = [
-        {
-            "id": "1",
-            "number": "1",
-            "title": "Title1",
-            "state": "open",
-            "comments": {
-                "items": [
-                    COMMENT_ONE,
-                    comment,
-                    COMMENT_TWO,
-                    comment],
-            },
-            "labels": ["Type-Issue", "Priority-High"],
-            "owner": {"kind": "projecthosting#issuePerson",
-                      "name": "User1"
-                     },
-        }]
-
-    self.issue_exporter.Init()
-    self.github_service.AddResponse(content={"number": 1})  # CreateIssue(...)
-    self.issue_exporter.Start()
-    # Remember, the first comment is for the issue.
-    self.assertEqual(3, self.issue_exporter._comment_number)
-    self.assertEqual(3, self.issue_exporter._comment_total)
-
-    # Set the deletedBy information for the comment object, now they
-    # should be ignored by the export.
+
+
+def _MakeIssue(issue_id, comments, labels=(), state="open",
+               owner_name="User1"):
+  """Returns the Google Code JSON for issue "Title<issue_id>"."""
+  return {
+      "id": str(issue_id),
+      "number": str(issue_id),
+      "title": "Title%d" % issue_id,
+      "state": state,
+      "comments": {
+          "items": list(comments),
+      },
+      "labels": list(labels),
+      "owner": {"kind": "projecthosting#issuePerson",
+                "name": owner_name
+               },
+  }
+
+
+# Google Code issues to export. No test modifies them, so they are shared
+# rather than rebuilt for every test.
+TEST_ISSUE_DATA = [
+    _MakeIssue(1, [COMMENT_ONE, COMMENT_TWO, COMMENT_THREE],
+               ["Type-Issue", "Priority-High"]),
+    _MakeIssue(2, [COMMENT_ONE], state="closed", owner_name="User2"),
+    _MakeIssue(3, [COMMENT_ONE, COMMENT_TWO], ["Type-Defect"],
+               state="closed", owner_name="User3"),
+]
+
+
+def testGetAllPreviousIssues(issue_exporter, github_service):
+  open_issues_response = [{"number": 9, "title": "Title2", "comments": 2}]
+  closed_issues_response = [{"number": 10, "title": "Title1", "comments": 1}]
+
+  issue_exporter._issue_json_data = TEST_ISSUE_DATA
+  github_service.AddResponses([open_issues_response, closed_issues_response])
+  issue_exporter.Init()
+
+  index = issue_exporter._issue_index
+  assert len(index) == 3
+
+  assert len(index["Title1"]) == 1
+  assert index["Title1"][0]["exported"] is True
+  assert index["Title1"][0]["googlecode_id"] == "1"
+  assert index["Title1"][0]["exported_id"] == 10
+  assert index["Title1"][0]["comment_count"] == 1
+
+  assert len(index["Title2"]) == 1
+  assert index["Title2"][0]["exported"] is True
+  assert index["Title2"][0]["googlecode_id"] == "2"
+  assert index["Title2"][0]["exported_id"] == 9
+  assert index["Title2"][0]["comment_count"] == 2
+
+  assert len(index["Title3"]) == 1
+  assert index["Title3"][0]["exported"] is False
+
+
+def testCreateIssue(issue_exporter, github_service):
+  github_service.AddResponse(content={"number": 1234})
+  issue_number = issue_exporter._CreateIssue(SINGLE_ISSUE)
+  assert issue_number == 1234
+
+
+def testCreateIssueFailedOpenRequest(issue_exporter, github_service):
+  github_service.AddFailureResponse()
+  with pytest.raises(issues.ServiceError):
+    issue_exporter._CreateIssue(SINGLE_ISSUE)
+
+
+def testCreateIssueFailedCloseRequest(issue_exporter, github_service):
+  content = {"number": 1234}
+  github_service.AddResponse(content=content)
+  github_service.AddFailureResponse()
+  issue_number = issue_exporter._CreateIssue(SINGLE_ISSUE)
+  assert issue_number == 1234
+
+
+def testCreateComments(issue_exporter):
+  assert issue_exporter._comment_number == 0
+  issue_exporter._CreateComments(COMMENTS_DATA, 1234, SINGLE_ISSUE)
+  assert issue_exporter._comment_number == 4
+
+
+def testCreateCommentsFailure(issue_exporter, github_service):
+  github_service.AddFailureResponse()
+  assert issue_exporter._comment_number == 0
+  with pytest.raises(issues.ServiceError):
+    issue_exporter._CreateComments(COMMENTS_DATA, 1234, SINGLE_ISSUE)
+
+
+@pytest.mark.parametrize("exported, responses, expected", [
+    # Nothing exported yet. Note: Some responses are from CreateIssues,
+    # others are from CreateComment.
+    ({},
+     [{"number": 1}, {"number": 10}, {"number": 11}, {"number": 2},
+      {"number": 20}, {"number": 3}, {"number": 30}],
+     (3, 3, 1, 1, 0)),
+    # Title1 and Title2 were already created, only Title3 is exported.
+    ({"Title1": 1, "Title2": 2},
+     [{"number": 3}, {"number": 3}],
+     (3, 3, 1, 1, 2)),
+    # Title1 was exported but is missing 2 comments. First requests are to
+    # re-add comments, then create issues.
+    ({"Title1": 1},
+     [{"number": 11}, {"number": 12}, {"number": 2}, {"number": 3}],
+     (3, 3, 1, 1, 1)),
+], ids=["NewIssues", "SkipAlreadyCreatedIssues", "ReAddMissedComments"])
+def testStart(issue_exporter, github_service, exported, responses, expected):
+  issue_exporter._issue_json_data = TEST_ISSUE_DATA
+  issue_exporter.Init()
+  for title, comment_count in exported.items():
+    issue_exporter._issue_index[title][0].update(
+        {"exported": True, "comment_count": comment_count})
+  github_service.AddResponses(responses)
+
+  issue_exporter.Start()
+
+  # Comment counts are per issue and should match the numbers from the last
+  # issue created, minus one for the first comment, which is really
+  # the issue description.
+  assert (issue_exporter._issue_total,
+          issue_exporter._issue_number,
+          issue_exporter._comment_number,
+          issue_exporter._comment_total,
+          issue_exporter._skipped_issues) == expected
+
+
+# Remember, the first comment is for the issue. Once the deletedBy information
+# is set for the duplicated comments they should be ignored by the export.
+@pytest.mark.parametrize("deleted, expected", [(False, 3), (True, 1)],
+                         ids=["NotDeleted", "Deleted"])
+def testStart_SkipDeletedComments(issue_exporter, github_service, deleted,
+                                  expected):
+  comment = {
+      "content": "one",
+      "id": 1,
+      "published": "last year",
+      "author": {"name": "user@email.com"},
+      "updates": {
+          "labels": ["added-label", "-removed-label"],
+          },
+      }
+  if deleted:
     comment["deletedBy"] = {}
 
-    self.issue_exporter.Init()
-    self.github_service.AddResponse(content={"number": 1})  # CreateIssue(...)
-    self.issue_exporter.Start()
-    self.assertEqual(1, self.issue_exporter._comment_number)
-    self.assertEqual(1, self.issue_exporter._comment_total)
-
-  def testStart_SkipAlreadyCreatedIssues(self):
-    self.issue_exporter._issue_json_data = self.TEST_ISSUE_DATA
-    self.issue_exporter.Init()
-    self.issue_exporter._issue_index["Title1"][0]["exported"] = True
-    self.issue_exporter._issue_index["Title1"][0]["comment_count"] = 1
-    self.issue_exporter._issue_index["Title2"][0]["exported"] = True
-    self.issue_exporter._issue_index["Title2"][0]["comment_count"] = 2
-    self.github_service.AddResponse(content={"number": 3})  # CreateIssue(...)
-    self.github_service.AddResponse(content={"number": 3})  # CreateIssue(...)
-
-    self.issue_exporter.Start()
-    self.assertEqual(2, self.issue_exporter._skipped_issues)
-    self.assertEqual(3, self.issue_exporter._issue_total)
-    self.assertEqual(3, self.issue_exporter._issue_number)
-
-  def testStart_ReAddMissedComments(self):
-    self.issue_exporter._issue_json_data = self.TEST_ISSUE_DATA
-    self.issue_exporter.Init()
-    # Mark it as exported but missing 2 comments.
-    self.issue_exporter._issue_index["Title1"][0]["exported"] = True
-    self.issue_exporter._issue_index["Title1"][0]["comment_count"] = 1
-
-    # First requests to re-add comments, then create issues.
-    self.github_service.AddResponse(content={"number": 11})
-    self.github_service.AddResponse(content={"number": 12})
-
-    self.github_service.AddResponse(content={"number": 2})
-    self.github_service.AddResponse(content={"number": 3})
-
-    self.issue_exporter.Start()
-
-    self.assertEqual(1, self.issue_exporter._skipped_issues)
-    self.assertEqual(3, self.issue_exporter._issue_total)
-    self.assertEqual(3, self.issue_exporter._issue_number)
-
-
-if __name__ == "__main__":
-  unittest.main(buffer=True)
+  issue_exporter._issue_json_data = [
+      _MakeIssue(1, [COMMENT_ONE, comment, COMMENT_TWO, comment],
+                 ["Type-Issue", "Priority-High"])]
+
+  issue_exporter.Init()
+  github_service.AddResponse(content={"number": 1})  # CreateIssue(...)
+  issue_exporter.Start()
+  assert issue_exporter._comment_number == expected
+  assert issue_exporter._comment_total == expected
@@ -228,6 +228,10 @@ class FakeGitHubService(GitHubService):
     self._github_oauth_token = github_oauth_token
     self._action_queue = collections.deque([])
 
+  def Reset(self):
+    """Removes all queued responses from the reponse queue."""
+    self._action_queue.clear()
+
   def AddSuccessfulResponse(self, content=None):
     """Adds a succesfull response with no content to the reponse queue."""
     self.AddResponse(content=content)
@@ -238,18 +242,20 @@ class FakeGitHubService(GitHubService):
 
   def AddResponse(self, response=httplib.OK, content=None):
     """Adds a response to the response queue."""
-    status = {"status": response}
-    full_response = {}
-    full_response["status"] = status
-    full_response["content"] = content if content else {}
-    self._action_queue.append(full_response)
+    self._action_queue.append(
+        ({"status": response}, content if content else {}))
+
+  def AddResponses(self, contents):
+    """Adds a successful response for each of the contents to the queue."""
+    self._action_queue.extend(
+        ({"status": httplib.OK}, content if content else {})
+        for content in contents)
 
   def _PerformHttpRequest(self, method, url, body="{}", params=None):
     if not self._action_queue:
       return {"status": httplib.OK}, {}
 
-    full_response = self._action_queue.popleft()
-    return (full_response["status"], full_response["content"])
+    return self._action_queue.popleft()
 
   def PerformGetRequest(self, url, params=None):
     """Makes a fake GET request.
@@ -20,7 +20,6 @@ import json
 import unittest
 import urlparse
 
-import issues
 import github_services
 
 from issues_test import DEFAULT_USERNAME